@@ -258,13 +258,17 @@ class BeamSearchDecoder(nn.Module, ABC):
             predicted_tokens.append(tokens)
 
             if i + 1 < sequence_length:
-                if teacher_forcing_ratio <= 1:
-                    use_predictions = torch.as_tensor(torch.rand(batch_size, device=device) >= teacher_forcing_ratio)
+                if teacher_forcing_ratio >= 1:  # If teacher forcing is used in every step
+                    decoder_input = outputs[i + 1, :]
+                elif teacher_forcing_ratio <= 0:  # Greedy decoding always continues from predicted tokens
+                    # Clone, since `_preprocess_decoder_inputs` overrides replace OOV tokens in place and
+                    # would otherwise corrupt the sequence already appended to `predicted_tokens`
+                    decoder_input = tokens.clone()
+                else:
+                    use_predictions = torch.rand(batch_size, device=device) >= teacher_forcing_ratio
                     # Depending on the value of `use_predictions` in next step decoder will use predicted tokens or
                     # ground truth values (teacher forcing)
                     decoder_input = torch.where(use_predictions, tokens, outputs[i + 1, :])
-                else:  # If teacher forcing is used in every step
-                    decoder_input = outputs[i + 1, :]
 
         predictions = torch.stack(predictions)
         predicted_tokens = torch.stack(predicted_tokens)
@@ -12,6 +12,17 @@ class View(nn.Module):
         return x_in.view(self.shape)
 
 
+# Unlike View this also accepts non-contiguous inputs, copying only when the strides require it,
+# so it replaces a Contiguous + View pair with a single call
+class Reshape(nn.Module):
+    def __init__(self, *shape: int):
+        super().__init__()
+        self.shape = shape
+
+    def forward(self, x_in: Tensor) -> Tensor:
+        return x_in.reshape(self.shape)
+
+
 class Permute(nn.Module):
     def __init__(self, *dimensions: int):
         super().__init__()
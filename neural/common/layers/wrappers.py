@@ -1,10 +1,42 @@
-from typing import Tuple, Any, Union
+import math
+from typing import List, Tuple, Any, Union
 
+import torch
 import torch.nn as nn
 from torch import Tensor
 from torch.nn.utils.rnn import pack_padded_sequence, pad_packed_sequence
 
 
+@torch.jit.script
+def _lstm_cell_forward(inputs: Tensor, hidden: Tensor, cell: Tensor, weight_ih: Tensor, weight_hh: Tensor,
+                       bias_ih: Tensor, bias_hh: Tensor) -> Tuple[Tensor, Tensor]:
+    gates = torch.mm(inputs, weight_ih.t()) + torch.mm(hidden, weight_hh.t()) + bias_ih + bias_hh
+    input_gate, forget_gate, cell_gate, output_gate = gates.chunk(4, 1)
+
+    input_gate = torch.sigmoid(input_gate)
+    forget_gate = torch.sigmoid(forget_gate)
+    cell_gate = torch.tanh(cell_gate)
+    output_gate = torch.sigmoid(output_gate)
+
+    cell = forget_gate * cell + input_gate * cell_gate
+    hidden = output_gate * torch.tanh(cell)
+
+    return hidden, cell
+
+
+@torch.jit.script
+def _lstm_cell_sequence(inputs: Tensor, hidden: Tensor, cell: Tensor, weight_ih: Tensor, weight_hh: Tensor,
+                        bias_ih: Tensor, bias_hh: Tensor) -> Tuple[Tensor, Tensor]:
+    hidden_steps = torch.jit.annotate(List[Tensor], [])
+    cell_steps = torch.jit.annotate(List[Tensor], [])
+    for i in range(inputs.shape[0]):
+        hidden, cell = _lstm_cell_forward(inputs[i], hidden, cell, weight_ih, weight_hh, bias_ih, bias_hh)
+        hidden_steps.append(hidden)
+        cell_steps.append(cell)
+
+    return torch.stack(hidden_steps), torch.stack(cell_steps)
+
+
 class PackedRNN(nn.Module):
     def __init__(self, rnn_module: nn.RNNBase):
         super().__init__()
@@ -23,6 +55,35 @@ class PackedRNN(nn.Module):
         return output_padded, hidden
 
 
+# Drop-in replacement for nn.LSTMCell (same parameter names, so state dicts stay compatible) with the pointwise
+# gate operations fused into a single kernel by the TorchScript fuser, instead of one kernel launch per op
+class JitLSTMCell(nn.Module):
+    def __init__(self, input_size: int, hidden_size: int):
+        super().__init__()
+        self.input_size = input_size
+        self.hidden_size = hidden_size
+        self.weight_ih = nn.Parameter(torch.empty(4 * hidden_size, input_size))
+        self.weight_hh = nn.Parameter(torch.empty(4 * hidden_size, hidden_size))
+        self.bias_ih = nn.Parameter(torch.empty(4 * hidden_size))
+        self.bias_hh = nn.Parameter(torch.empty(4 * hidden_size))
+        self.reset_parameters()
+
+    def reset_parameters(self) -> None:
+        bound = 1 / math.sqrt(self.hidden_size)
+        for parameter in self.parameters():
+            nn.init.uniform_(parameter, -bound, bound)
+
+    def forward(self, inputs: Tensor, state: Tuple[Tensor, Tensor]) -> Tuple[Tensor, Tensor]:
+        hidden, cell = state
+        return _lstm_cell_forward(inputs, hidden, cell, self.weight_ih, self.weight_hh, self.bias_ih, self.bias_hh)
+
+    # Unrolls the cell over a whole (sequence, batch, features) input inside a single scripted graph,
+    # returning hidden and cell states for every step
+    def forward_sequence(self, inputs: Tensor, state: Tuple[Tensor, Tensor]) -> Tuple[Tensor, Tensor]:
+        hidden, cell = state
+        return _lstm_cell_sequence(inputs, hidden, cell, self.weight_ih, self.weight_hh, self.bias_ih, self.bias_hh)
+
+
 class Residual(nn.Module):
     def __init__(self, module: nn.Module, input_position: int = 0):
         super().__init__()
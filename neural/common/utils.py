@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import List, Tuple, Dict, Callable, Any
 
 import torch
+import torch.nn as nn
 from nltk.tokenize.treebank import TreebankWordDetokenizer
 from torch import Tensor
 from torchtext.vocab import Vocab
@@ -49,6 +50,19 @@ def get_device(use_cuda: bool, cuda_index: int = 0, log_method: Callable[[str],
     return device
 
 
+def compile_model(model: nn.Module, log_method: Callable[[str], None] = print) -> nn.Module:
+    # In-place compilation (torch >= 2.2) is used instead of the torch.compile wrapper: the wrapper
+    # prefixes every state-dict key with _orig_mod., which would break checkpoint save/resume against
+    # uncompiled models
+    if hasattr(nn.Module, 'compile'):
+        log_method(f'Compiling {model.__class__.__name__} with torch.compile...')
+        model.compile()
+    else:
+        log_method('In-place torch.compile is not available in this torch version, running the model eagerly.')
+
+    return model
+
+
 def convert_input_to_device(inputs: Tuple[Any, ...], device: torch.device) -> Tuple[Any, ...]:
     inputs_in_device = []
     for tensor_in in inputs:
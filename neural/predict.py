@@ -4,6 +4,7 @@ from pathlib import Path
 from typing import List, Tuple, Dict, Union, Type
 
 import torch
+import torch.nn as nn
 from torch.nn.utils.rnn import pad_sequence
 from torchtext.data.utils import get_tokenizer
 from torchtext.vocab import Vocab
@@ -22,7 +23,7 @@ from utils.general import tokenize_text_content
 class NewsPredictor:
     def __init__(self, summarization_vocab_size: int, use_cuda: bool, cuda_index: int = 0,
                  path_to_models: Union[Path, str] = '../data/saved/models',
-                 path_to_vocabs: Union[Path, str] = '../data/saved/vocabs'):
+                 path_to_vocabs: Union[Path, str] = '../data/saved/vocabs', quantize: bool = False):
         connector = DatabaseConnector()
         if isinstance(path_to_models, str):
             path_to_models = Path(path_to_models)
@@ -31,6 +32,7 @@ class NewsPredictor:
 
         self.__path_to_models = path_to_models
         self.__device = utils.get_device(use_cuda, cuda_index)
+        self.__quantize = quantize and not use_cuda  # Dynamic quantization only targets CPU inference
         self.__tokenizer = get_tokenizer('spacy', language='en_core_web_sm')
 
         self.__ner_datasets = connector.get_datasets_identifiers('Named Entity Recognition')
@@ -112,6 +114,11 @@ class NewsPredictor:
         model.load_state_dict(weights[weights_key])
         model = model.to(self.__device)
         model.eval()
+        if self.__quantize:
+            # Replace Linear/LSTM weights with int8 versions quantized on the fly; activations stay float,
+            # so no calibration pass is needed
+            model = torch.quantization.quantize_dynamic(model, {nn.Linear, nn.LSTM, nn.LSTMCell},
+                                                        dtype=torch.qint8)
         del weights
 
         return model
@@ -21,15 +21,13 @@ class Encoder(nn.Module):
         )
         self.reduce_hidden = nn.Sequential(
             layers.Transpose(0, 1),
-            layers.Contiguous(),
-            layers.View(-1, 2 * hidden_size),
+            layers.Reshape(-1, 2 * hidden_size),
             nn.Linear(2 * hidden_size, hidden_size),
             nn.ReLU()
         )
         self.reduce_cell = nn.Sequential(
             layers.Transpose(0, 1),
-            layers.Contiguous(),
-            layers.View(-1, 2 * hidden_size),
+            layers.Reshape(-1, 2 * hidden_size),
             nn.Linear(2 * hidden_size, hidden_size),
             nn.ReLU()
         )
@@ -45,9 +43,24 @@ class Encoder(nn.Module):
         return out, features, (hidden, cell)
 
 
+@torch.jit.script
+def _attention_weights(scores: Tensor, encoder_mask: Tensor,
+                       coverage: Optional[Tensor]) -> Tuple[Tensor, Tensor, Optional[Tensor]]:
+    attention = torch.softmax(scores, dim=0) * encoder_mask
+    # If encoder_mask sets some weights to zero, than they don't sum to one, so re-normalization is needed
+    attention = attention / torch.sum(attention, dim=0, keepdim=True)
+    attention = attention.t()
+
+    if coverage is not None:
+        coverage = coverage + attention
+
+    return attention.unsqueeze(1), attention, coverage
+
+
 class Attention(nn.Module):
-    def __init__(self, hidden_size: int):
+    def __init__(self, hidden_size: int, use_context_buffer: bool = True):
         super().__init__()
+        self.use_context_buffer = use_context_buffer
         self.features = nn.Sequential(
             nn.Linear(2 * hidden_size, 2 * hidden_size),
             layers.Unsqueeze(0),
@@ -57,43 +70,51 @@ class Attention(nn.Module):
             layers.Unsqueeze(-1),
             nn.Linear(1, 2 * hidden_size, bias=False)
         )
-        self.attention_first = nn.Sequential(
+        self.score = nn.Sequential(
             nn.Tanh(),
             nn.Linear(2 * hidden_size, 1, bias=False),
-            layers.Squeeze(-1),
-            nn.Softmax(dim=0)
-        )
-        self.attention_second = nn.Sequential(
-            # If encoder_mask sets some weights to zero, than they don't sum to one, so re-normalization is needed
-            layers.Normalize(0),
-            layers.Transpose(0, 1),
-            layers.Unsqueeze(1)
+            layers.Squeeze(-1)
         )
         self.context = layers.SequentialMultiInput(
             layers.MatrixProduct(),
             layers.View(-1, 2 * hidden_size)
         )
+        self.__context_buffer = None
 
     def forward(self, decoder_hidden: Tensor, encoder_out: Tensor, encoder_features: Tensor, encoder_mask: Tensor,
-                coverage: Optional[Tensor]) -> Tuple[Tensor, Tensor, Optional[Tensor]]:
-        decoder_features = self.features(decoder_hidden)
+                coverage: Optional[Tensor], decoder_features: Optional[Tensor] = None) -> \
+            Tuple[Tensor, Tensor, Optional[Tensor]]:
+        if decoder_features is None:  # Teacher-forced decoding precomputes features for all steps at once
+            decoder_features = self.features(decoder_hidden)
         attention = encoder_features + decoder_features
 
         if coverage is not None:  # If training with coverage
             coverage_features = self.coverage(coverage)
             attention = attention + coverage_features
 
-        attention = self.attention_first(attention)
-        attention = attention * encoder_mask
-        attention = self.attention_second(attention)
+        scores = self.score(attention)
+        # Softmax, masking, re-normalization, coverage update and the bmm layout change run in one scripted
+        # graph, so the intermediate buffers between them are fused away instead of materialized per step
+        attention, weights, coverage = _attention_weights(scores, encoder_mask, coverage)
+        if torch.is_grad_enabled() or not self.use_context_buffer:
+            context = self.context(attention, encoder_out)
+        else:
+            # At inference no graph is recorded, so the bmm result can be written into a buffer that is
+            # reused across decoder steps instead of allocating a fresh one per token. Restricted to greedy
+            # decoding so beam-search bookkeeping never has to reason about module-level buffer lifetimes
+            context = self.__context_bmm(attention, encoder_out)
 
-        context = self.context(attention, encoder_out)
-        attention = torch.squeeze(attention)
+        return context, weights, coverage
 
-        if coverage is not None:
-            coverage = coverage + attention
+    def __context_bmm(self, attention: Tensor, encoder_out: Tensor) -> Tensor:
+        shape = (attention.shape[0], 1, encoder_out.shape[2])
+        buffer = self.__context_buffer
+        if buffer is None or buffer.shape != shape or buffer.device != attention.device:
+            buffer = torch.empty(shape, device=attention.device, dtype=attention.dtype)
+            self.__context_buffer = buffer
 
-        return context, attention, coverage
+        torch.bmm(attention, encoder_out, out=buffer)
+        return buffer.view(-1, encoder_out.shape[2])
 
 
 class Decoder(BeamSearchDecoder):
@@ -103,8 +124,8 @@ class Decoder(BeamSearchDecoder):
         self.unk_index = unk_index
         self.hidden_size = hidden_size
         self.vocab_size = vocab_size
-        self.attention = Attention(hidden_size)
-        self.lstm = nn.LSTMCell(input_size=embedding_dim, hidden_size=hidden_size)
+        self.attention = Attention(hidden_size, use_context_buffer=beam_size == 1)
+        self.lstm = layers.JitLSTMCell(input_size=embedding_dim, hidden_size=hidden_size)
         self.context = nn.Sequential(
             nn.Linear(2 * hidden_size + embedding_dim, embedding_dim)
         )
@@ -115,26 +136,105 @@ class Decoder(BeamSearchDecoder):
         )
         self.out = layers.SequentialMultiInput(
             layers.Concatenate(1),
+            # The stacked Linears form a low-rank factorization of the vocab projection, which is far
+            # cheaper than one fused (4H, V) layer since the vocab is much larger than the hidden size
             nn.Linear(4 * hidden_size, hidden_size),
             nn.Linear(hidden_size, vocab_size),
             nn.Softmax(dim=1)
         )
+        self.__input_buffer = None
+
+    def forward(self, outputs: Optional[Tensor], embedding: nn.Embedding, teacher_forcing_ratio: float, batch_size: int,
+                device: str, cyclic_inputs: Tuple[Any, ...],
+                constant_inputs: Tuple[Any, ...]) -> Tuple[Tensor, Tensor, Any]:
+        if self.training and teacher_forcing_ratio >= 1:
+            return self.__decode_teacher_forced(outputs, embedding, batch_size, device, cyclic_inputs, constant_inputs)
+
+        return super().forward(outputs, embedding, teacher_forcing_ratio, batch_size, device, cyclic_inputs,
+                               constant_inputs)
+
+    def __decode_teacher_forced(self, outputs: Optional[Tensor], embedding: nn.Embedding, batch_size: int, device: str,
+                                cyclic_inputs: Tuple[Tuple[Tensor, Tensor], Tensor, Tensor],
+                                constant_inputs: Tuple[Tensor, Tensor, Tensor, Tensor, int]) -> \
+            Tuple[Tensor, Tensor, Tuple[Tensor, Optional[Tensor]]]:
+        encoder_hidden, context, coverage = cyclic_inputs
+        outputs = self._validate_outputs(outputs, 1, batch_size, device)
+        sequence_length = outputs.shape[0]
+
+        # With full teacher forcing all decoder inputs are known upfront, so the embedding, context projection and
+        # LSTM can run over the whole sequence at once; the initial (zero) context is fed at every step (as in
+        # decoder_step) to decouple the LSTM from the attention recurrence, only attention and coverage stay stepwise
+        embedded = embedding(outputs)
+        contexts = context.unsqueeze(0).expand(sequence_length, -1, -1)
+        lstm_inputs = self.context(torch.cat((contexts, embedded), dim=2))
+        hidden_states, cell_states = self.lstm.forward_sequence(lstm_inputs, encoder_hidden)
+
+        # The decoder-side attention inputs don't depend on coverage, so the hidden/cell concatenation and
+        # the attention feature projection are also hoisted out of the loop and computed for all steps at once
+        decoder_hiddens = torch.cat((hidden_states, cell_states), dim=2)
+        decoder_features = self.attention.features[0](decoder_hiddens)
+
+        # Pre-allocate per-step results once and write each step into its slice, instead of appending to
+        # Python lists and re-materializing them with torch.stack afterwards
+        encoder_out, oov_size = constant_inputs[0], constant_inputs[4]
+        source_length = encoder_out.shape[1]
+        predictions = torch.empty((sequence_length, batch_size, self.vocab_size + oov_size), device=device)
+        predicted_tokens = torch.empty((sequence_length, batch_size), dtype=torch.long, device=device)
+        attentions = torch.empty((sequence_length, batch_size, source_length), device=device)
+        coverages = torch.empty_like(attentions) if coverage is not None else None
+
+        for i in range(sequence_length):
+            prediction, attention, coverage = self.__attend_and_generate(decoder_hiddens[i], lstm_inputs[i],
+                                                                         coverage, constant_inputs,
+                                                                         decoder_features[i].unsqueeze(0))
+            predictions[i] = prediction
+            predicted_tokens[i] = self._get_predicted_tokens(prediction).detach()
+            attentions[i] = attention
+            if coverages is not None:
+                coverages[i] = coverage
+
+        return predictions, predicted_tokens, (attentions, coverages)
 
     def decoder_step(self, decoder_input: Tensor, cyclic_inputs: Tuple[Tuple[Tensor, Tensor], Tensor, Tensor],
                      constant_inputs: Tuple[Tensor, Tensor, Tensor, Tensor, int]) -> Tuple[Tensor, Tuple[Any, ...],
                                                                                            Tuple[Any, ...]]:
-        encoder_hidden, previous_context, coverage = cyclic_inputs
-        encoder_out, encoder_features, encoder_mask, inputs_extended, oov_size = constant_inputs
+        encoder_hidden, context, coverage = cyclic_inputs
 
-        outputs = torch.cat((previous_context, decoder_input), dim=1)
+        if torch.is_grad_enabled():
+            outputs = torch.cat((context, decoder_input), dim=1)
+        else:  # At inference write both halves into a buffer reused across steps instead of allocating a cat
+            outputs = self.__fill_input_buffer(context, decoder_input)
         outputs = self.context(outputs)
         hidden, cell = self.lstm(outputs, encoder_hidden)
-
         decoder_hidden = torch.cat((hidden, cell), dim=1)
+        final, attention, coverage = self.__attend_and_generate(decoder_hidden, outputs, coverage, constant_inputs)
+
+        # The initial (zero) context is threaded through unchanged, so stepwise decoding feeds the LSTM the
+        # same constant context as the batched teacher-forced path
+        return final, ((hidden, cell), context, coverage), (attention, coverage)
+
+    def __fill_input_buffer(self, context: Tensor, decoder_input: Tensor) -> Tensor:
+        context_size = context.shape[1]
+        shape = (context.shape[0], context_size + decoder_input.shape[1])
+        buffer = self.__input_buffer
+        if buffer is None or buffer.shape != shape or buffer.device != context.device:
+            buffer = torch.empty(shape, device=context.device, dtype=context.dtype)
+            self.__input_buffer = buffer
+
+        buffer[:, :context_size].copy_(context)
+        buffer[:, context_size:].copy_(decoder_input)
+        return buffer
+
+    def __attend_and_generate(self, decoder_hidden: Tensor, lstm_input: Tensor, coverage: Optional[Tensor],
+                              constant_inputs: Tuple[Tensor, Tensor, Tensor, Tensor, int],
+                              decoder_features: Optional[Tensor] = None) -> \
+            Tuple[Tensor, Tensor, Optional[Tensor]]:
+        encoder_out, encoder_features, encoder_mask, inputs_extended, oov_size = constant_inputs
+
         context, attention, coverage = self.attention(decoder_hidden, encoder_out, encoder_features, encoder_mask,
-                                                      coverage)
+                                                      coverage, decoder_features)
 
-        p_gen = self.pointer_generator(context, decoder_hidden, outputs)
+        p_gen = self.pointer_generator(context, decoder_hidden, lstm_input)
         out = self.out(decoder_hidden, context)
         vocab_distribution = p_gen * out
         oov_attention = (1 - p_gen) * attention
@@ -143,9 +243,9 @@ class Decoder(BeamSearchDecoder):
             oov_zeros = torch.zeros((batch_size, oov_size), device=vocab_distribution.device)
             vocab_distribution = torch.cat((vocab_distribution, oov_zeros), dim=1)
 
-        final = torch.scatter_add(vocab_distribution, 1, inputs_extended.transpose(0, 1), oov_attention)
+        final = torch.scatter_add(vocab_distribution, 1, inputs_extended, oov_attention)
 
-        return final, ((hidden, cell), context, coverage), (attention, coverage)
+        return final, attention, coverage
 
     def _preprocess_decoder_inputs(self, decoder_inputs: Tensor) -> Tensor:
         if not self.training:  # Remove OOV tokens in validation phase
@@ -202,7 +302,10 @@ class PointerGeneratorNetwork(BaseModel):
 
         inputs_embedded = self.embedding(inputs)
         encoder_out, encoder_features, encoder_hidden = self.encoder(inputs_embedded, inputs_lengths)
-        encoder_mask = torch.clip(inputs, min=0, max=1)
+        # Cast the mask and transpose the extended inputs once here, instead of paying a type promotion
+        # and a transpose dispatch on every decoder step
+        encoder_mask = torch.clip(inputs, min=0, max=1).float()
+        inputs_extended = inputs_extended.t()
 
         context = torch.zeros((batch_size, 2 * self.hidden_size), device=device)
         if self.with_coverage:
@@ -215,11 +318,14 @@ class PointerGeneratorNetwork(BaseModel):
                                                         device, cyclic_inputs=(encoder_hidden, context, coverage),
                                                         constant_inputs=(encoder_out, encoder_features, encoder_mask,
                                                                          inputs_extended, oov_size))
-        attention_list, coverage_list = zip(*decoder_outputs)
-        attentions = torch.stack(attention_list)
-        if self.with_coverage:
-            coverages = torch.stack(coverage_list)
+        if isinstance(decoder_outputs, tuple):  # Teacher-forced decoding returns pre-stacked tensors
+            attentions, coverages = decoder_outputs
         else:
-            coverages = None
+            attention_list, coverage_list = zip(*decoder_outputs)
+            attentions = torch.stack(attention_list)
+            if self.with_coverage:
+                coverages = torch.stack(coverage_list)
+            else:
+                coverages = None
 
         return outputs, tokens, attentions, coverages
@@ -5,8 +5,12 @@ from typing import List, Tuple, Optional, Any, Dict
 
 import torch
 import torch.nn as nn
+import torch.nn.functional as functional
 from torch import Tensor
 
+# Fused attention kernels (FlashAttention, etc.) are available from torch 2.0 onwards
+_FUSED_ATTENTION_AVAILABLE = hasattr(functional, 'scaled_dot_product_attention')
+
 import neural.common.layers as layers
 from neural.common.data.vocab import SpecialTokens
 from neural.common.layers.decode import BeamSearchDecoder, BeamSearchNode
@@ -73,12 +77,19 @@ class SelfAttention(nn.Module):
         key = self.key(inputs_key)
         value = self.value(inputs_value)
 
-        attention = torch.matmul(query, key) / self.scale
-        if mask is not None:
-            attention = attention.masked_fill(mask, -math.inf)
-
-        attention = torch.softmax(attention, dim=-1)
-        attention = torch.matmul(attention, value)
+        if _FUSED_ATTENTION_AVAILABLE:
+            # The fused kernel expects keys in (batch, heads, sequence, features) layout and a boolean mask
+            # marking positions that are allowed to attend; it applies the 1/sqrt(d_k) scaling itself
+            attention_mask = torch.logical_not(mask) if mask is not None else None
+            attention = functional.scaled_dot_product_attention(query, key.transpose(-2, -1), value,
+                                                                attn_mask=attention_mask)
+        else:
+            attention = torch.matmul(query, key) / self.scale
+            if mask is not None:
+                attention = attention.masked_fill(mask, -math.inf)
+
+            attention = torch.softmax(attention, dim=-1)
+            attention = torch.matmul(attention, value)
 
         return self.out(attention)
 
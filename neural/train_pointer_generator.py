@@ -100,6 +100,7 @@ def main() -> None:
     bos_index = vocab.stoi[SpecialTokens.BOS.value]
     eos_index = vocab.stoi[SpecialTokens.EOS.value]
     model = PointerGeneratorNetwork.create_from_args(vars(args), bos_index, eos_index, vocab.unk_index)
+    model = utils.compile_model(model)
     iterations_without_coverage = len(train_dataset) * (args.epochs - 1) \
         if not args.eval_only else math.inf
 
@@ -15,6 +15,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument('--vocab-path', type=str, help='Path to saved vocabs', default='../data/saved/vocabs')
     parser.add_argument('--summarization-vocab-size', type=int, help='Summarization vocab size', default=50000)
     parser.add_argument('--use-gpu', action='store_true', help='Run predictor with CUDA')
+    parser.add_argument('--quantize', action='store_true', help='Use dynamic int8 quantization (CPU only)')
 
     return parser.parse_args()
 
@@ -27,7 +28,8 @@ def main() -> None:
         summarization_vocab_size=args.summarization_vocab_size,
         use_cuda=args.use_gpu,
         path_to_models=args.models_path,
-        path_to_vocabs=args.vocab_path
+        path_to_vocabs=args.vocab_path,
+        quantize=args.quantize
     )
 
     for country in connector.get_countries():
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Dict, Any
@@ -26,6 +28,25 @@ class NamedEntity:
     words: str
 
 
+# Structure-of-arrays layout for entity spans: consumers that only need positions/lengths/names iterate
+# parallel lists sorted by position instead of touching one NamedEntity object per span
+@dataclass(init=True, repr=True, eq=False)
+class NamedEntitySpans:
+    positions: List[int] = field(default_factory=list)
+    lengths: List[int] = field(default_factory=list)
+    short_names: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_entities(cls, entities: List[NamedEntity]) -> NamedEntitySpans:
+        spans = cls()
+        for entity in sorted(entities, key=lambda entity: entity.position):
+            spans.positions.append(entity.position)
+            spans.lengths.append(entity.length)
+            spans.short_names.append(entity.short_name)
+
+        return spans
+
+
 @dataclass(init=True, repr=True, eq=False)
 class NewsArticle:
     article_id: int
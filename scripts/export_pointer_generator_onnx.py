@@ -0,0 +1,126 @@
+import argparse
+from pathlib import Path
+from typing import Tuple
+
+import torch
+import torch.nn as nn
+from torch import Tensor
+
+import neural.common.utils as utils
+from neural.common.data.vocab import SpecialTokens, VocabBuilder
+from neural.summarization.pointer_generator import PointerGeneratorNetwork
+
+
+# The full model runs a data-dependent decode loop (beam search, OOV handling), which a single ONNX graph
+# can't express. Serving engines handle this by exporting two fixed-shape graphs - the encoder and one
+# decoder step - and running the loop on the host; the resulting .onnx files can be compiled into TensorRT
+# engines with trtexec as-is since every shape is static.
+class EncoderExport(nn.Module):
+    def __init__(self, model: PointerGeneratorNetwork):
+        super().__init__()
+        self.embedding = model.embedding
+        self.encoder = model.encoder
+
+    def forward(self, inputs: Tensor) -> Tuple[Tensor, Tensor, Tensor, Tensor]:
+        # Fixed-shape serving feeds padded batches of one known length, so the (data-dependent,
+        # non-exportable) sequence packing from PackedRNN is bypassed and the LSTM is called directly
+        embedded = self.embedding(inputs)
+        out, (hidden, cell) = self.encoder.lstm.rnn_module(embedded)
+        features = self.encoder.features(out)
+        out = out.transpose(0, 1)
+
+        hidden = self.encoder.reduce_hidden(hidden)
+        cell = self.encoder.reduce_cell(cell)
+
+        return out, features, hidden, cell
+
+
+class DecoderStepExport(nn.Module):
+    def __init__(self, model: PointerGeneratorNetwork):
+        super().__init__()
+        self.embedding = model.embedding
+        self.decoder = model.decoder
+
+    def forward(self, tokens: Tensor, hidden: Tensor, cell: Tensor, context: Tensor, coverage: Tensor,
+                encoder_out: Tensor, encoder_features: Tensor, encoder_mask: Tensor,
+                inputs_extended: Tensor) -> Tuple[Tensor, Tensor, Tensor, Tensor, Tensor]:
+        decoder_input = self.embedding(tokens)
+        cyclic_inputs = ((hidden, cell), context, coverage)
+        # OOV size is zero for the fixed-shape graph; the host-side loop rescatters OOV probabilities
+        constant_inputs = (encoder_out, encoder_features, encoder_mask, inputs_extended, 0)
+        prediction, ((hidden, cell), context, coverage), _ = self.decoder.decoder_step(decoder_input, cyclic_inputs,
+                                                                                      constant_inputs)
+
+        return prediction, hidden, cell, context, coverage
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Export Pointer-Generator encoder and decoder step to ONNX.')
+    parser.add_argument('--model-path', type=Path, default='../data/saved/models/pointer_generator',
+                        help='Path to saved model directory (with args.json)')
+    parser.add_argument('--weights-name', type=str, default='pointer_generator.pt', help='Weights file name')
+    parser.add_argument('--vocab-path', type=Path, default='../data/saved/vocabs', help='Path to saved vocabs')
+    parser.add_argument('--output-path', type=Path, default='../data/saved/onnx', help='Output directory')
+    parser.add_argument('--dataset', type=str, default='cnn_dailymail', help='Dataset name for vocab lookup')
+    parser.add_argument('--batch-size', type=int, default=1, help='Fixed batch size of exported graphs')
+    parser.add_argument('--article-length', type=int, default=400, help='Fixed article length of exported graphs')
+    parser.add_argument('--opset', type=int, default=12, help='ONNX opset version')
+
+    return parser.parse_args()
+
+
+def load_model(args: argparse.Namespace) -> PointerGeneratorNetwork:
+    model_args = utils.load_args_from_file(args.model_path)
+    vocab = VocabBuilder.build_vocab(args.dataset, 'summarization', vocab_size=model_args['vocab_size'],
+                                     vocab_dir=args.vocab_path)
+    bos_index = vocab.stoi[SpecialTokens.BOS.value]
+    eos_index = vocab.stoi[SpecialTokens.EOS.value]
+    model = PointerGeneratorNetwork.create_from_args(model_args, bos_index, eos_index, vocab.unk_index)
+
+    weights = torch.load(args.model_path / args.weights_name, map_location='cpu')
+    for key in weights.keys():
+        if 'state_dict' in key and 'optimizer' not in key:
+            model.load_state_dict(weights[key])
+            break
+    else:
+        raise ValueError(f'Can\'t find model state dict in weights file {args.weights_name}.')
+
+    model.activate_coverage()
+    model.eval()
+
+    return model
+
+
+def main() -> None:
+    args = parse_args()
+    args.output_path.mkdir(parents=True, exist_ok=True)
+    model = load_model(args)
+    vocab_size = model.decoder.vocab_size
+    hidden_size = model.hidden_size
+
+    inputs = torch.randint(1, vocab_size, (args.article_length, args.batch_size))
+    encoder = EncoderExport(model)
+    encoder_out, encoder_features, hidden, cell = encoder(inputs)
+    torch.onnx.export(encoder, (inputs,), str(args.output_path / 'pointer_generator_encoder.onnx'),
+                      opset_version=args.opset, input_names=['inputs'],
+                      output_names=['encoder_out', 'encoder_features', 'hidden', 'cell'])
+    print(f'Exported encoder graph ({args.article_length} x {args.batch_size}).')
+
+    tokens = torch.randint(1, vocab_size, (args.batch_size,))
+    context = torch.zeros((args.batch_size, 2 * hidden_size))
+    coverage = torch.zeros((args.batch_size, args.article_length))
+    encoder_mask = torch.ones((args.article_length, args.batch_size))
+    inputs_extended = inputs.t()
+    decoder_step = DecoderStepExport(model)
+    torch.onnx.export(decoder_step,
+                      (tokens, hidden, cell, context, coverage, encoder_out, encoder_features, encoder_mask,
+                       inputs_extended),
+                      str(args.output_path / 'pointer_generator_decoder_step.onnx'), opset_version=args.opset,
+                      input_names=['tokens', 'hidden', 'cell', 'context', 'coverage', 'encoder_out',
+                                   'encoder_features', 'encoder_mask', 'inputs_extended'],
+                      output_names=['prediction', 'hidden_out', 'cell_out', 'context_out', 'coverage_out'])
+    print('Exported decoder step graph.')
+
+
+if __name__ == '__main__':
+    main()
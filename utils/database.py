@@ -1,15 +1,18 @@
 import pickle
+import time
 from collections import Counter
 from collections import defaultdict
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 
-import mysql.connector as mysql
+import MySQLdb as mysql
 
 from news.article import NewsSite, Country, NewsArticle, NamedEntity, NewsModel
 from utils.singleton import Singleton
 
 
 class DatabaseConnector(metaclass=Singleton):
+    __ARTICLES_CACHE_TTL = 60.  # Seconds before the cached article list is refreshed from the database
+
     def __init__(self):
         self.__database = mysql.connect(
             host='localhost',
@@ -18,6 +21,9 @@ class DatabaseConnector(metaclass=Singleton):
             database='news'
         )
         self.__cursor = self.__database.cursor()
+        self.__articles_cache: Optional[List[NewsArticle]] = None
+        self.__articles_cache_time = 0.
+        self.__news_sites_cache: Dict[int, NewsSite] = {}
 
     def get_countries(self) -> List[Country]:
         query = 'SELECT c.name, c.code, l.code FROM countries c INNER JOIN languages l on c.language_id = l.id'
@@ -95,6 +101,7 @@ class DatabaseConnector(metaclass=Singleton):
         self.__cursor.execute(query, (article.title, article.content, article.article_url,
                                       article.article_date, site_id, article.image_url))
         self.__database.commit()
+        self.__articles_cache = None  # New article invalidates the cached list
         return self.__cursor.lastrowid
 
     def add_article_summaries(self, article_id: int, summaries: Dict[int, str]) -> None:
@@ -172,24 +179,29 @@ class DatabaseConnector(metaclass=Singleton):
         return self.__cursor.fetchone()[0]
 
     def get_articles(self, model_id: int = None, tags: Tuple[str, ...] = ()) -> List[NewsArticle]:
-        if model_id is None:
-            query = 'SELECT * FROM news_articles'
-            self.__cursor.execute(query)
-
-        else:
-            tags_str = ','.join(f'"{tag}"' for tag in tags)
-            query = f'SELECT DISTINCT na.id, title, content, article_url, article_date, site_id, image_url ' \
-                    f'FROM news_articles na INNER JOIN article_tag_map atm ON na.id = atm.article_id WHERE ' \
-                    f'atm.model_id = %s AND words IN ({tags_str})'
-            self.__cursor.execute(query, (model_id,))
+        if model_id is None:  # Unfiltered list is rendered on every page view, so keep it cached between calls
+            # The scraper inserts articles from a separate process, so the cache also expires after a TTL
+            # instead of relying on in-process invalidation alone
+            cache_expired = time.monotonic() - self.__articles_cache_time > self.__ARTICLES_CACHE_TTL
+            if self.__articles_cache is None or cache_expired:
+                query = 'SELECT * FROM news_articles'
+                self.__cursor.execute(query)
+                self.__articles_cache = self.__build_articles()
+                self.__articles_cache_time = time.monotonic()
+
+            return list(self.__articles_cache)
+
+        tags_str = ','.join(f'"{tag}"' for tag in tags)
+        query = f'SELECT DISTINCT na.id, title, content, article_url, article_date, site_id, image_url ' \
+                f'FROM news_articles na INNER JOIN article_tag_map atm ON na.id = atm.article_id WHERE ' \
+                f'atm.model_id = %s AND words IN ({tags_str})'
+        self.__cursor.execute(query, (model_id,))
 
-        articles = []
-        for article_id, title, content, url, date, site_id, image_url in self.__cursor.fetchall():
-            news_site = self.__get_news_site(site_id)
-            article = NewsArticle(article_id, title, content, url, date, news_site, image_url)
-            articles.append(article)
+        return self.__build_articles()
 
-        return articles
+    def __build_articles(self) -> List[NewsArticle]:
+        return [NewsArticle(article_id, title, content, url, date, self.__get_news_site(site_id), image_url)
+                for article_id, title, content, url, date, site_id, image_url in self.__cursor.fetchall()]
 
     def get_single_article(self, article_id: int) -> NewsArticle:
         query = 'SELECT * FROM news_articles WHERE id = %s'
@@ -257,9 +269,13 @@ class DatabaseConnector(metaclass=Singleton):
         return self.__cursor.fetchall()
 
     def __get_news_site(self, site_id: int) -> NewsSite:
-        query = 'SELECT news_sites.name, news_sites.code FROM news_sites INNER JOIN countries ON ' \
-                'news_sites.country_id = countries.id WHERE news_sites.id = %s'
-        self.__cursor.execute(query, (site_id,))
-        name, code = self.__cursor.fetchone()
-
-        return NewsSite(name, code, Country('United States', 'us', 'en'))
+        news_site = self.__news_sites_cache.get(site_id)
+        if news_site is None:  # Sites are a small static table, so memoize instead of one SELECT per article row
+            query = 'SELECT news_sites.name, news_sites.code FROM news_sites INNER JOIN countries ON ' \
+                    'news_sites.country_id = countries.id WHERE news_sites.id = %s'
+            self.__cursor.execute(query, (site_id,))
+            name, code = self.__cursor.fetchone()
+            news_site = NewsSite(name, code, Country('United States', 'us', 'en'))
+            self.__news_sites_cache[site_id] = news_site
+
+        return news_site
@@ -1,6 +1,10 @@
+import functools
+from typing import Tuple
+
 import flask
 from torchtext.data.utils import get_tokenizer
 
+from news.article import NamedEntitySpans
 from utils.database import DatabaseConnector
 from utils.general import tokenize_text_content
 
@@ -11,6 +15,14 @@ ner_models = connector.get_models_by_task('Named Entity Recognition', full_datas
 summarization_models = connector.get_models_by_task('Abstractive Summarization', full_dataset_name=True)
 
 
+# Article contents never change after scraping, so tokenization (and the article lookup behind it) can be
+# cached between requests instead of running the spacy pipeline on every page view
+@functools.lru_cache(maxsize=256)
+def tokenize_article_content(article_id: int) -> Tuple[str, ...]:
+    article = connector.get_single_article(article_id)
+    return tuple(tokenize_text_content(article.content, word_tokenizer=word_tokenizer))
+
+
 @app.route('/', methods=['GET'])
 def get_home():
     return flask.redirect(flask.url_for('get_articles'))
@@ -41,17 +53,21 @@ def get_articles_filter():
 
 @app.route('/article-entities/<int:article_id>/<int:model_id>', methods=['GET'])
 def get_articles_entities(article_id: int, model_id: int):
-    article = connector.get_single_article(article_id)
-    named_entities = connector.get_article_named_entities(model_id, article_id)
-    tokens = tokenize_text_content(article.content, word_tokenizer=word_tokenizer)
-
-    for entity in named_entities:
-        start_token = tokens[entity.position]
-        tokens[entity.position] = f'<div class="btn btn-sm article-tag tag-{entity.short_name.lower()}">{start_token}'
-        last_position = entity.position + entity.length - 1
-        tokens[last_position] = f'{tokens[last_position]} <span class="badge">{entity.short_name}</span></div>'
-
-    content = ' '.join(tokens)
+    entity_spans = NamedEntitySpans.from_entities(connector.get_article_named_entities(model_id, article_id))
+    tokens = tokenize_article_content(article_id)
+
+    # Collect per-position markup first, then build the content in a single join over the tokens,
+    # instead of rewriting the token list entry by entry
+    prefixes = {}
+    suffixes = {}
+    for position, length, short_name in zip(entity_spans.positions, entity_spans.lengths, entity_spans.short_names):
+        # Concatenate when spans share a boundary token, so overlapping entities keep their tags balanced
+        prefix = f'<div class="btn btn-sm article-tag tag-{short_name.lower()}">'
+        suffix = f' <span class="badge">{short_name}</span></div>'
+        prefixes[position] = prefix + prefixes.get(position, '')
+        suffixes[position + length - 1] = suffixes.get(position + length - 1, '') + suffix
+
+    content = ' '.join(f'{prefixes.get(i, "")}{token}{suffixes.get(i, "")}' for i, token in enumerate(tokens))
 
     return flask.jsonify(content)
 